@@ -1,6 +1,11 @@
+from employee_loader import load_file, load_lines, report_to_stderr
+from instance_counter import ShardedCounter
+
+
 class Employee:
 
-    num_of_emps = 0
+    # thread-safe: `num_of_emps += 1` on a plain int can lose counts across threads
+    num_of_emps = ShardedCounter()
     raise_amt = 1.04
 
     def __init__(self, first, last, pay):
@@ -9,7 +14,7 @@ class Employee:
         self.email = first + '.' + last + '@email.com'
         self.pay = pay
 
-        Employee.num_of_emps += 1
+        Employee.num_of_emps.increment()
 
     def fullname(self):
         return '{} {}'.format(self.first, self.last)
@@ -24,7 +29,16 @@ class Employee:
     @classmethod
     def from_string(cls, emp_str):
         first, last, pay = emp_str.split('-')
-        return cls(first, last, pay)
+        return cls(first, last, int(pay))
+
+    # Bulk versions of from_string for large dumps: one 'first-last-pay' record per line.
+    @classmethod
+    def from_lines(cls, lines, on_error=report_to_stderr):
+        return load_lines(cls, lines, 3, (2,), on_error)
+
+    @classmethod
+    def from_file(cls, path, on_error=report_to_stderr, workers=None):
+        return load_file(cls, path, 3, (2,), on_error, workers=workers)
 
     @staticmethod
     def is_workday(day):
@@ -53,8 +67,48 @@ new_emp_1 = Employee.from_string(emp_str_1)
 
 print(new_emp_1.email)
 print(new_emp_1.pay)
+print(Employee.num_of_emps)
 
 import datetime
 my_date = datetime.date(2016, 7, 11)
 
-print(Employee.is_workday(my_date))
\ No newline at end of file
+print(Employee.is_workday(my_date))
+
+for emp in Employee.from_lines(['Jane-Doe-90000', 'bad-record', 'Steve-Smith-30000'], on_error=print):
+    print(emp.fullname(), emp.pay)
+
+
+def benchmark(n=1_000_000, workers=4):
+    import os
+    import tempfile
+    from time import perf_counter
+
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(fd, 'w') as f:
+        for i in range(n):
+            f.write('First{0}-Last{0}-{1}\n'.format(i, 30000 + i % 70000))
+    try:
+        start = perf_counter()
+        with open(path) as f:
+            emps = [Employee.from_string(line.rstrip('\n')) for line in f]
+        per_line = perf_counter() - start
+
+        start = perf_counter()
+        bulk_emps = list(Employee.from_file(path))
+        bulk = perf_counter() - start
+
+        start = perf_counter()
+        pool_emps = list(Employee.from_file(path, workers=workers))
+        pool = perf_counter() - start
+
+        assert [e.pay for e in emps] == [e.pay for e in bulk_emps] == [e.pay for e in pool_emps]
+        print("{:,} records".format(n))
+        print("  from_string per line     : {:,.0f} records/sec".format(n / per_line))
+        print("  from_file                : {:,.0f} records/sec".format(n / bulk))
+        print("  from_file(workers={})     : {:,.0f} records/sec".format(workers, n / pool))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -1,15 +1,51 @@
+from functools import cached_property
+
+
 class Employee:
 
     raise_amt = 1.04
 
     def __init__(self, first, last, pay):
-        self.first = first
-        self.last = last
-        self.email = first + '.' + last + '@email.com'
+        # set the backing fields directly: nothing is cached yet, and the derived
+        # fields (email, fullname) are only built when someone asks for them
+        self._first = first
+        self._last = last
         self.pay = pay
 
+    # first/last are properties so that changing them drops the cached derived fields
+    @property
+    def first(self):
+        return self._first
+
+    @first.setter
+    def first(self, value):
+        self._first = value
+        self._invalidate_names()
+
+    @property
+    def last(self):
+        return self._last
+
+    @last.setter
+    def last(self, value):
+        self._last = value
+        self._invalidate_names()
+
+    def _invalidate_names(self):
+        # cached_property stores its value in the instance __dict__
+        self.__dict__.pop('email', None)
+        self.__dict__.pop('_fullname', None)
+
+    @cached_property
+    def email(self):
+        return self._first + '.' + self._last + '@email.com'
+
+    @cached_property
+    def _fullname(self):
+        return '{} {}'.format(self._first, self._last)
+
     def fullname(self):
-        return '{} {}'.format(self.first, self.last)
+        return self._fullname
 
     def apply_raise(self):
         self.pay = int(self.pay * self.raise_amt)
@@ -23,25 +59,69 @@ class Developer(Employee):
         self.prog_lang = prog_lang
 
 
+class EmployeeRoster:
+    """
+    Insertion-ordered set of employees backed by a dict, so membership checks,
+    adds and removes are O(1) instead of a scan over a list.
+    """
+
+    def __init__(self, employees=()):
+        self._emps = dict.fromkeys(employees)
+
+    def add(self, emp):
+        self._emps[emp] = None
+
+    def discard(self, emp):
+        self._emps.pop(emp, None)
+
+    def update(self, emps):
+        self._emps.update(dict.fromkeys(emps))
+
+    def difference_update(self, emps):
+        pop = self._emps.pop
+        for emp in emps:
+            pop(emp, None)
+
+    def __contains__(self, emp):
+        return emp in self._emps
+
+    def __iter__(self):
+        return iter(self._emps)
+
+    def __len__(self):
+        return len(self._emps)
+
+    def __repr__(self):
+        return 'EmployeeRoster({!r})'.format(list(self._emps))
+
+
 class Manager(Employee):
 
     def __init__(self, first, last, pay, employees=None):
         super().__init__(first, last, pay)
         if employees is None:
-            self.employees = []
+            self.employees = EmployeeRoster()
         else:
-            self.employees = employees
+            self.employees = EmployeeRoster(employees)
 
     def add_emp(self, emp):
-        if emp not in self.employees:
-            self.employees.append(emp)
+        self.employees.add(emp)
 
     def remove_emp(self, emp):
-        if emp in self.employees:
-            self.employees.remove(emp)
+        self.employees.discard(emp)
+
+    def add_emps(self, emps):
+        self.employees.update(emps)
+
+    def remove_emps(self, emps):
+        self.employees.difference_update(emps)
+
+    def iter_emps(self):
+        # streams the roster; don't add/remove employees while iterating
+        yield from self.employees
 
     def print_emps(self):
-        for emp in self.employees:
+        for emp in self.iter_emps():
             print('-->', emp.fullname())
 
 
@@ -56,4 +136,91 @@ mgr_1.add_emp(dev_2)
 mgr_1.print_emps()
 mgr_1.remove_emp(dev_2)
 
-mgr_1.print_emps()
\ No newline at end of file
+mgr_1.print_emps()
+
+
+def benchmark(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6), list_limit=10 ** 4):
+    from time import perf_counter
+
+    class ListManager(Manager):
+        # the old list-backed roster, kept for comparison
+        def __init__(self, first, last, pay):
+            Employee.__init__(self, first, last, pay)
+            self.employees = []
+
+        def add_emp(self, emp):
+            if emp not in self.employees:
+                self.employees.append(emp)
+
+        def remove_emp(self, emp):
+            if emp in self.employees:
+                self.employees.remove(emp)
+
+    print("{:>9} {:>12} {:>12} {:>12} {:>12}".format(
+        'reports', 'list add', 'roster add', 'add_emps', 'remove_emps'))
+    for n in sizes:
+        emps = [Employee('Test', str(i), 50000) for i in range(n)]
+
+        list_time = '-'
+        if n <= list_limit:
+            mgr = ListManager('Sue', 'Smith', 90000)
+            start = perf_counter()
+            for emp in emps:
+                mgr.add_emp(emp)
+            list_time = '{:.4f}s'.format(perf_counter() - start)
+
+        mgr = Manager('Sue', 'Smith', 90000)
+        start = perf_counter()
+        for emp in emps:
+            mgr.add_emp(emp)
+        add_time = perf_counter() - start
+
+        mgr = Manager('Sue', 'Smith', 90000)
+        start = perf_counter()
+        mgr.add_emps(emps)
+        bulk_time = perf_counter() - start
+
+        start = perf_counter()
+        mgr.remove_emps(emps[::2])
+        remove_time = perf_counter() - start
+        assert len(mgr.employees) == n - len(emps[::2])
+
+        print("{:>9,} {:>12} {:>11.4f}s {:>11.4f}s {:>11.4f}s".format(
+            n, list_time, add_time, bulk_time, remove_time))
+
+
+def benchmark_derived_fields(n=200_000, calls=20):
+    from time import perf_counter
+
+    class EagerEmployee:
+        # the previous version: email built in __init__, fullname formatted per call
+        def __init__(self, first, last, pay):
+            self.first = first
+            self.last = last
+            self.email = first + '.' + last + '@email.com'
+            self.pay = pay
+
+        def fullname(self):
+            return '{} {}'.format(self.first, self.last)
+
+    names = [str(i) for i in range(n)]
+    print("{:,} employees, fullname() called {} times each".format(n, calls))
+    for cls in (EagerEmployee, Employee):
+        start = perf_counter()
+        emps = [cls('Test', name, 50000) for name in names]
+        build = perf_counter() - start
+
+        start = perf_counter()
+        for emp in emps:
+            for _ in range(calls):
+                emp.fullname()
+        repeated = perf_counter() - start
+        print("  {:<14} construction {:.4f}s   repeated fullname() {:.4f}s".format(cls.__name__, build, repeated))
+
+
+if __name__ == '__main__':
+    dev_1.first = 'Cory'
+    print(dev_1.fullname(), dev_1.email)
+
+    benchmark()
+    benchmark_derived_fields()
@@ -0,0 +1,218 @@
+"""
+    # Argument validation that is prepared once, when the function is decorated.
+    # ErrorCheck (class-decorator-6.py) builds a new list on every call
+      (any([isinstance(i, str) for i in params])) and only looks at positional arguments.
+    # validate() reads the wrapped function's signature and annotations once and generates
+      the source code of a wrapper with the *same* parameter list. The wrapper contains one
+      plain `isinstance` test per parameter (a loop for *args / **kwargs) and then calls
+      the original function, so a call allocates nothing extra and stops at the first bad value.
+    # Rules:
+        * a parameter annotated with a class (or tuple of classes) must be an instance of it,
+        * reject=(str,) refuses those types for every parameter (what ErrorCheck does),
+        * a parameter left at its default value is not checked.
+      Other annotations (strings, typing generics) are ignored.
+    # Validation can be switched off globally with set_enabled(False) or the environment
+      variable VALIDATE_ARGS=0. It is checked at decoration time: a disabled validate()
+      returns the function itself, so there is no per-call cost at all.
+"""
+import inspect
+import os
+from functools import update_wrapper
+
+ENABLED = os.environ.get('VALIDATE_ARGS', '1') != '0'
+
+
+def set_enabled(enabled):
+    """Turn validation on/off for functions decorated from now on."""
+    global ENABLED
+    ENABLED = enabled
+
+
+def _as_types(annotation):
+    if annotation is inspect.Parameter.empty:
+        return None
+    if isinstance(annotation, type):
+        return annotation
+    if isinstance(annotation, tuple) and annotation and all(isinstance(t, type) for t in annotation):
+        return annotation
+    return None
+
+
+def _type_names(types):
+    if isinstance(types, type):
+        return types.__name__
+    return ' or '.join(t.__name__ for t in types)
+
+
+def _fail(func_name, param, value, required, reject):
+    if reject and isinstance(value, reject):
+        raise TypeError("{}(): parameter '{}' cannot be {}".format(func_name, param, type(value).__name__))
+    raise TypeError("{}(): parameter '{}' must be {}, got {}".format(
+        func_name, param, _type_names(required), type(value).__name__))
+
+
+def _check_source(value, required, reject):
+    """Source of the condition that is true when `value` is NOT acceptable."""
+    conditions = []
+    if required is not None:
+        conditions.append('not isinstance({}, {})'.format(value, required))
+    if reject is not None:
+        conditions.append('isinstance({}, _v_reject)'.format(value))
+    return ' or '.join(conditions)
+
+
+def _build_wrapper(function, reject):
+    sig = inspect.signature(function)
+    namespace = {'_v_func': function, '_v_fail': _fail, '_v_reject': reject,
+                 '_v_name': function.__qualname__}
+    params = []
+    call = []
+    checks = []
+    seen_var_positional = False
+    positional_only = False
+
+    for index, param in enumerate(sig.parameters.values()):
+        name = param.name
+        required = _as_types(param.annotation)
+        if required is not None:
+            namespace['_v_type_{}'.format(index)] = required
+            required_name = '_v_type_{}'.format(index)
+        else:
+            required_name = None
+        check = _check_source(name if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD) else '_v',
+                              required_name, reject)
+        fail = '_v_fail(_v_name, {!r}, {{}}, {}, _v_reject)'.format(name, required_name)
+
+        text = name
+        if param.default is not param.empty:
+            namespace['_v_default_{}'.format(index)] = param.default
+            text += '=_v_default_{}'.format(index)
+            if check:
+                check = '{} is not _v_default_{} and ({})'.format(name, index, check)
+
+        if param.kind == param.POSITIONAL_ONLY:
+            positional_only = True
+        elif positional_only:
+            params.append('/')
+            positional_only = False
+
+        if param.kind == param.VAR_POSITIONAL:
+            seen_var_positional = True
+            params.append('*' + name)
+            call.append('*' + name)
+            if check:
+                checks.append('for _v in {}:\n        if {}:\n            {}'.format(name, check, fail.format('_v')))
+        elif param.kind == param.VAR_KEYWORD:
+            params.append('**' + name)
+            call.append('**' + name)
+            if check:
+                checks.append('for _v in {}.values():\n        if {}:\n            {}'.format(
+                    name, check, fail.format('_v')))
+        else:
+            if param.kind == param.KEYWORD_ONLY:
+                if not seen_var_positional:
+                    params.append('*')
+                    seen_var_positional = True
+                call.append('{0}={0}'.format(name))
+            else:
+                call.append(name)
+            params.append(text)
+            if check:
+                checks.append('if {}:\n        {}'.format(check, fail.format(name)))
+    if positional_only:
+        params.append('/')
+
+    if not checks:
+        return function
+    wrapper_name = function.__name__ if function.__name__.isidentifier() else 'wrapper'
+    source = 'def {}({}):\n    {}\n    return _v_func({})\n'.format(
+        wrapper_name, ', '.join(params), '\n    '.join(checks), ', '.join(call))
+    exec(source, namespace)
+    wrapper = namespace[wrapper_name]
+    wrapper._v_source = source
+    return update_wrapper(wrapper, function)
+
+
+def validate(function=None, *, reject=None):
+    """
+    @validate                 -> check annotated parameters
+    @validate(reject=str)     -> also refuse str for every parameter, like ErrorCheck
+    """
+    if isinstance(reject, type):
+        reject = (reject,)
+
+    def decorator(function):
+        if not ENABLED:
+            return function
+        return _build_wrapper(function, reject or None)
+
+    if function is None:
+        return decorator
+    return decorator(function)
+
+
+def benchmark(calls=100_000):
+    from time import perf_counter
+
+    class ErrorCheck:
+        # the version from class-decorator-6.py
+        def __init__(self, function):
+            self.function = function
+
+        def __call__(self, *params):
+            if any([isinstance(i, str) for i in params]):
+                raise TypeError("parameter cannot be a string !!")
+            else:
+                return self.function(*params)
+
+    def add_numbers(*numbers):
+        return sum(numbers)
+
+    def add_five(a: int, b: int, c: int, d: int, e: int):
+        return a + b + c + d + e
+
+    set_enabled(False)
+    disabled = validate(add_numbers, reject=str)
+    set_enabled(True)
+
+    cases = [
+        ('ErrorCheck(*numbers)', ErrorCheck(add_numbers), (1, 5, 50)),
+        ('validate(*numbers)', validate(add_numbers, reject=str), (1, 5, 50)),
+        ('validate disabled', disabled, (1, 5, 50)),
+        ('ErrorCheck(a..e)', ErrorCheck(add_five), (5,)),
+        ('validate(a: int..e: int)', validate(add_five, reject=str), (5,)),
+    ]
+    print("{:<26} {:>12} {:>12} {:>12}".format('', '1 arg', '5 args', '50 args'))
+    for label, func, sizes in cases:
+        row = []
+        for n in (1, 5, 50):
+            if n not in sizes:
+                row.append('-')
+                continue
+            args = tuple(range(n))
+            start = perf_counter()
+            for _ in range(calls):
+                func(*args)
+            row.append('{:.0f} ns'.format((perf_counter() - start) / calls * 1e9))
+        print("{:<26} {:>12} {:>12} {:>12}".format(label, *row))
+
+
+if __name__ == '__main__':
+    @validate(reject=str)
+    def add_numbers(*numbers):
+        return sum(numbers)
+
+    @validate
+    def give_raise(emp_name: str, pay: int, *, rate: (int, float) = 1.04):
+        return int(pay * rate)
+
+    print(add_numbers(1, 2, 3))
+    print(give_raise('Corey', 50000, rate=1.1))
+    for bad_call in (lambda: add_numbers(1, '2', 3), lambda: give_raise('Corey', '50000')):
+        try:
+            bad_call()
+        except TypeError as e:
+            print(e)
+    print(give_raise._v_source)
+
+    benchmark()
@@ -0,0 +1,199 @@
+"""
+    # Decorators that understand coroutines and generators.
+    # The wrappers in decorator-1.py ... decorator-7.py and Timer assume a plain function:
+      they call it, and whatever happens "after" runs as soon as the call returns.
+    # For `async def` functions the call only creates a coroutine object, and for generator
+      functions it only creates a generator, so a timer around them measures object
+      creation and the real work happens later, outside the wrapper.
+    # around(before, after) builds the right kind of wrapper for the function it decorates:
+        * plain function     -> plain wrapper
+        * coroutine function -> `async def` wrapper that awaits the call
+        * generator function -> generator wrapper (`yield from`, so send()/throw() and the
+                                return value pass through)
+        * async generator    -> async generator wrapper forwarding asend()/athrow()
+      `after` only runs when the call has really finished (returned, raised, or the
+      generator was exhausted/closed), and the return value is always passed back.
+    # Every wrapper uses functools.wraps, so __name__, __doc__, __wrapped__ etc. are kept.
+    # timed() is built on around(): it records the real execution span into the
+      latency histograms from latency_histogram.py.
+"""
+import inspect
+from functools import wraps
+from time import perf_counter_ns
+
+from latency_histogram import get_histogram
+
+FUNCTION = 'function'
+COROUTINE = 'coroutine'
+GENERATOR = 'generator'
+ASYNC_GENERATOR = 'async generator'
+
+
+def function_kind(func):
+    if inspect.iscoroutinefunction(func):
+        return COROUTINE
+    if inspect.isasyncgenfunction(func):
+        return ASYNC_GENERATOR
+    if inspect.isgeneratorfunction(func):
+        return GENERATOR
+    return FUNCTION
+
+
+def around(before, after):
+    """
+    Decorator factory. before(func, args, kwargs) runs when the call starts and its
+    return value (a token) is handed to after(func, token, error) once the call is done;
+    error is None on success.
+    """
+    def decorator(func):
+        kind = function_kind(func)
+
+        if kind == COROUTINE:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                token = before(func, args, kwargs)
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as error:
+                    after(func, token, error)
+                    raise
+                after(func, token, None)
+                return result
+
+        elif kind == GENERATOR:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                token = before(func, args, kwargs)
+                try:
+                    result = yield from func(*args, **kwargs)
+                except BaseException as error:
+                    after(func, token, error)
+                    raise
+                after(func, token, None)
+                return result
+
+        elif kind == ASYNC_GENERATOR:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                token = before(func, args, kwargs)
+                agen = func(*args, **kwargs)
+                try:
+                    item = await agen.__anext__()
+                    while True:
+                        try:
+                            sent = yield item
+                        except GeneratorExit:
+                            await agen.aclose()
+                            raise
+                        except BaseException as thrown:
+                            item = await agen.athrow(thrown)
+                        else:
+                            item = await (agen.__anext__() if sent is None else agen.asend(sent))
+                except StopAsyncIteration:
+                    after(func, token, None)
+                except BaseException as error:
+                    after(func, token, error)
+                    raise
+
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                token = before(func, args, kwargs)
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as error:
+                    after(func, token, error)
+                    raise
+                after(func, token, None)
+                return result
+
+        return wrapper
+    return decorator
+
+
+def timed(func=None, *, name=None):
+    """
+    Record the real execution span of func (awaits and generator iteration included)
+    into the latency histogram called `name` (default: module.qualname).
+    """
+    def decorator(func):
+        histogram = get_histogram(name or '{}.{}'.format(func.__module__, func.__qualname__))
+
+        def start(func, args, kwargs):
+            histogram.shard()[0] += 1
+            return perf_counter_ns()
+
+        def stop(func, started, error):
+            histogram.record(perf_counter_ns() - started)
+
+        return around(start, stop)(func)
+
+    if func is None:
+        return decorator
+    return decorator(func)
+
+
+def benchmark(tasks=100_000, steps=5):
+    import asyncio
+    from time import perf_counter
+
+    from latency_histogram import snapshot
+
+    async def handler(i):
+        for _ in range(steps):
+            await asyncio.sleep(0)
+        return i
+
+    timed_handler = timed(handler, name='bench.handler')
+
+    async def run(func):
+        results = await asyncio.gather(*(func(i) for i in range(tasks)))
+        assert results[-1] == tasks - 1
+
+    for label, func in (('undecorated', handler), ('timed', timed_handler)):
+        start = perf_counter()
+        asyncio.run(run(func))
+        elapsed = perf_counter() - start
+        print("  {:<12} {:,} concurrent tasks in {:.3f}s ({:.2f} us/task)".format(
+            label, tasks, elapsed, elapsed / tasks * 1e6))
+    stats = snapshot()['bench.handler']
+    print("  handler span: p50 {:.1f} ms, p99 {:.1f} ms, max {:.1f} ms".format(
+        stats['p50_ns'] / 1e6, stats['p99_ns'] / 1e6, stats['max_ns'] / 1e6))
+
+
+if __name__ == '__main__':
+    import asyncio
+    from time import sleep
+
+    from latency_histogram import snapshot
+
+    @timed
+    async def fetch(delay):
+        """Pretend to wait on the network."""
+        await asyncio.sleep(delay)
+        return delay
+
+    @timed
+    def countdown(n):
+        while n:
+            sleep(0.001)
+            yield n
+            n -= 1
+        return 'done'
+
+    @timed
+    async def ticks(n):
+        for i in range(n):
+            await asyncio.sleep(0.001)
+            yield i
+
+    async def main():
+        print(await fetch(0.02), fetch.__name__, fetch.__doc__)
+        print([i async for i in ticks(3)])
+
+    asyncio.run(main())
+    print(list(countdown(3)))
+    for name, stats in snapshot().items():
+        print(name, stats['count'], 'call(s), max {:.1f} ms'.format(stats['max_ns'] / 1e6))
+
+    benchmark()
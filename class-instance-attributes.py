@@ -5,13 +5,22 @@
 # it each time we create an instance. This can help count the
 # number of instances at the time of instantiation.
 
+# `InstanceCounter.count += 1` is not thread-safe: two threads can read the
+# same old value and one increment gets lost. ShardedCounter keeps one counter
+# per thread and adds them up when read. InstanceRegistry tracks the instances
+# that are still alive through weak references.
+
+from instance_counter import InstanceRegistry, ShardedCounter
+
 
 class InstanceCounter(object):
-    count = 0
+    count = ShardedCounter()
+    live = InstanceRegistry()
 
     def __init__(self, val):
         self.val = val
-        InstanceCounter.count += 1
+        InstanceCounter.count.increment()
+        InstanceCounter.live.register(self)
 
     def set_val(self, newval):
         self.val = newval
@@ -30,4 +39,7 @@ for obj in (a, b, c):
     print("value of obj: ", obj.get_val())
     print("Count : ",obj.get_count())
 
-print(a.get_val())
\ No newline at end of file
+print(a.get_val())
+
+del b
+print("Created: ", InstanceCounter.count, "Alive: ", len(InstanceCounter.live))
@@ -1,4 +1,4 @@
-    """
+"""
     ##class variable ##
     # A class method is a method which is bound to the class and not the object of the class.
     # It can modify a class state that would apply across all the instances of the class. 
@@ -23,6 +23,10 @@
     # We generally use static methods to create utility functions
     """
 from datetime import date
+
+from employee_loader import load_file, load_lines, report_to_stderr
+
+
 class Employee:
     def __init__(self, fistname, lastname, age, pay):
         self.firstame = fistname
@@ -39,7 +43,17 @@ class Employee:
     @classmethod
     def from_string(cls, emp_str):
         firstname, lastname, age, pay = emp_str.split('-')
-        return cls(firstname, lastname, age, pay)
+        return cls(firstname, lastname, int(age), int(pay))
+
+    # Bulk versions of from_string for large dumps, one "first-last-age-pay" record per line.
+    # Records are parsed chunk by chunk and malformed lines are reported, not raised.
+    @classmethod
+    def from_lines(cls, lines, on_error=report_to_stderr):
+        return load_lines(cls, lines, 4, (2, 3), on_error)
+
+    @classmethod
+    def from_file(cls, path, on_error=report_to_stderr, workers=None):
+        return load_file(cls, path, 4, (2, 3), on_error, workers=workers)
 
     # A class method to create a Person object by birth year.
     @classmethod
@@ -66,4 +80,7 @@ print (emp1.age)
 print (emp2.age)
 
 print(emp3.fullname())
-print(Employee.isAdult(22))
\ No newline at end of file
+print(Employee.isAdult(22))
+
+for emp in Employee.from_lines(["ravi-kumar-30-40000", "ravi-kumar-thirty-40000"], on_error=print):
+    print(emp.fullname(), emp.age, emp.pay)
@@ -5,12 +5,20 @@
     # This example shows how we can deal with multiple args.
     # Reminder : `args` is a list of arguments passed, while
       kwargs is a dictionary passed as arguments.
+    # The wrapper returns whatever the wrapped function returns, and
+      functools.wraps keeps the wrapped function's name and docstring.
+    # For coroutines and generators see async_decorators.py.
 """
 
 
+from functools import wraps
+
+
 def decorator(inner):
+    @wraps(inner)
     def inner_decorator(*args, **kwargs):
         print(args, kwargs)
+        return inner(*args, **kwargs)
     return inner_decorator
 
 
@@ -24,4 +32,5 @@ if __name__ == "__main__":
 """
     # This prints :
     ('Hello, how are you?',) {}
+    This happened : Hello, how are you?
 """
\ No newline at end of file
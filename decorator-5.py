@@ -3,8 +3,10 @@ def handle_exceptions(func_name):
     def inner(*args, **kwargs):
         try:
             return func_name(*args, **kwargs)
-        except Exception:
-            print("An exception was thrown : ", Exception)
+        except Exception as error:
+            # print the error itself, not the Exception class.
+            # resilience.py has a version that retries and re-raises instead of swallowing.
+            print("An exception was thrown : ", repr(error))
     return inner
 
 
@@ -13,4 +15,5 @@ def handle_exceptions(func_name):
 def divide(x, y):
     return x / y
 
-print(divide(8, 2))
\ No newline at end of file
+print(divide(8, 2))
+print(divide(8, 0))
\ No newline at end of file
@@ -1,7 +1,11 @@
+from functools import wraps
+
+
 def decorator(inner):
+    @wraps(inner)
     def inner_decorator(*args, **kwargs):
         print("This function takes " + str(len(args)) + " arguments")
-        inner(*args)
+        return inner(*args, **kwargs)
     return inner_decorator
 
 
@@ -0,0 +1,200 @@
+"""
+    # Streaming bulk loader for employee records stored as 'John-Doe-70000' strings.
+    # Employee.from_string() parses one string per call. For dumps with millions of
+      records the per-call overhead dominates, so this module:
+        * reads the file in large chunks (through mmap when the file supports it),
+        * splits every chunk into rows and converts the numeric columns in bulk,
+        * reports malformed lines (wrong field count, non-numeric pay) without stopping,
+        * can split a file into byte ranges and parse them in a process pool.
+    # The classmethods Employee.from_lines() / Employee.from_file() in ClassStaticMethod.py
+      and class_static_method.py are thin wrappers around load_lines() / load_file().
+    # Malformed records are passed to on_error(location, line, message). The location is
+      the line number for load_lines() and the byte offset of the line for load_file().
+"""
+import gc
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+CHUNK_SIZE = 1 << 22   # 4 MiB
+BATCH_LINES = 10000    # lines per batch for load_lines()
+
+
+def report_to_stderr(location, line, message):
+    print("Skipping malformed record at {}: {!r} ({})".format(location, line, message), file=sys.stderr)
+
+
+def parse_rows(lines, n_fields, int_fields, sep='-'):
+    """
+    Split lines into n_fields columns and convert the int_fields columns to int.
+    Returns (columns, errors); errors holds (index into lines, message) pairs.
+    """
+    # Fast path: every line has the right shape, so the whole batch is split in one
+    # go and the columns are sliced out and converted without a per-line Python loop.
+    # (Only strings are created here, which keeps the cyclic GC out of the picture.)
+    if lines and [line.count(sep) for line in lines].count(n_fields - 1) == len(lines):
+        fields = sep.join(lines).split(sep)
+        columns = [fields[col::n_fields] for col in range(n_fields)]
+        try:
+            for col in int_fields:
+                columns[col] = list(map(int, columns[col]))
+        except ValueError:
+            pass
+        else:
+            return columns, []
+
+    good = []
+    errors = []
+    for index, line in enumerate(lines):
+        fields = line.split(sep)
+        if len(fields) != n_fields:
+            if fields != ['']:   # blank lines are skipped silently
+                errors.append((index, "expected {} fields, got {}".format(n_fields, len(fields))))
+            continue
+        try:
+            for col in int_fields:
+                fields[col] = int(fields[col])
+        except ValueError as e:
+            errors.append((index, str(e)))
+            continue
+        good.append(fields)
+    return list(zip(*good)) or [()] * n_fields, errors
+
+
+def build_objects(cls, columns):
+    """
+    cls(*row) for every row of the columns. Building millions of objects that are
+    kept alive makes the cyclic GC rescan them over and over, so it is paused while
+    a batch is built (the new objects do not form reference cycles).
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return list(map(cls, *columns))
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load_lines(cls, lines, n_fields, int_fields, on_error=report_to_stderr, sep='-'):
+    """
+    Lazily build cls(*fields) objects from an iterable of record strings.
+    """
+    lines = iter(lines)
+    line_no = 1
+    while True:
+        batch = list(islice(lines, BATCH_LINES))
+        if not batch:
+            return
+        columns, errors = parse_rows([line.rstrip('\r\n') for line in batch], n_fields, int_fields, sep)
+        if on_error is not None:
+            for index, message in errors:
+                on_error(line_no + index, batch[index].rstrip('\r\n'), message)
+        line_no += len(batch)
+        yield from build_objects(cls, columns)
+
+
+def _aligned_range(buf, start, end):
+    """Move [start, end) so it covers whole lines: a line belongs to the range holding its first byte."""
+    size = len(buf)
+    if start > 0 and buf[start - 1:start] != b'\n':
+        start = buf.find(b'\n', start)
+        start = size if start == -1 else start + 1
+    if end < size and buf[end - 1:end] != b'\n':
+        end = buf.find(b'\n', end)
+        end = size if end == -1 else end + 1
+    return start, max(start, end)
+
+
+def _parse_buffer(buf, start, end, n_fields, int_fields, sep, chunk_size):
+    """Parse the whole lines in buf[start:end] chunk by chunk, yielding (rows, errors) per chunk."""
+    start, end = _aligned_range(buf, start, end)
+    while start < end:
+        stop = min(start + chunk_size, end)
+        if stop < end:
+            newline = buf.rfind(b'\n', start, stop)
+            stop = newline + 1 if newline != -1 else _aligned_range(buf, start, stop)[1]
+        text = buf[start:stop].decode('utf-8', errors='replace')
+        lines = text.split('\n')
+        if not lines[-1]:
+            lines.pop()
+        columns, errors = parse_rows([line.rstrip('\r') for line in lines], n_fields, int_fields, sep)
+        if errors:
+            # byte offsets are only worked out for the (rare) bad lines
+            starts = [0]
+            for line in lines:
+                starts.append(starts[-1] + len(line.encode('utf-8')) + 1)
+            errors = [(start + starts[index], lines[index].rstrip('\r'), message) for index, message in errors]
+        yield columns, errors
+        start = stop
+
+
+def _parse_file_range(path, start, end, n_fields, int_fields, sep, chunk_size):
+    """Process pool worker: parse one byte range of the file."""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return list(_parse_buffer(buf, start, end, n_fields, int_fields, sep, chunk_size))
+
+
+def _iter_file_chunks(f, n_fields, int_fields, sep, chunk_size):
+    """Fallback for files that cannot be mmapped: read blocks and carry the partial last line over."""
+    offset = 0
+    tail = b''
+    while True:
+        block = f.read(chunk_size)
+        data = tail + block
+        if not block:
+            if not data:
+                return
+            data += b'\n'
+        cut = data.rfind(b'\n') + 1
+        tail = data[cut:]
+        for columns, errors in _parse_buffer(data, 0, cut, n_fields, int_fields, sep, chunk_size):
+            yield columns, [(offset + location, line, message) for location, line, message in errors]
+        offset += cut
+        if not block:
+            return
+
+
+def _iter_chunks(path, n_fields, int_fields, sep, chunk_size, workers):
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # empty files and pipes cannot be mapped
+            yield from _iter_file_chunks(f, n_fields, int_fields, sep, chunk_size)
+            return
+
+    with buf:
+        if not workers or workers <= 1:
+            yield from _parse_buffer(buf, 0, size, n_fields, int_fields, sep, chunk_size)
+            return
+
+    # Byte ranges of a few chunks each; at most 2 ranges per worker are in flight
+    # so a multi-GB file is never held in memory at once.
+    range_size = chunk_size * 4
+    ranges = [(start, min(start + range_size, size)) for start in range(0, size, range_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for start, end in ranges:
+            pending.append(executor.submit(_parse_file_range, path, start, end, n_fields, int_fields, sep, chunk_size))
+            if len(pending) >= 2 * workers:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+
+def load_file(cls, path, n_fields, int_fields, on_error=report_to_stderr, sep='-',
+              chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Lazily build cls(*fields) objects from a file with one record per line.
+    With workers > 1 the file is split into byte ranges parsed by a process pool;
+    records still come out in file order.
+    """
+    for columns, errors in _iter_chunks(path, n_fields, int_fields, sep, chunk_size, workers):
+        if on_error is not None:
+            for location, line, message in errors:
+                on_error(location, line, message)
+        yield from build_objects(cls, columns)
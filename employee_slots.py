@@ -0,0 +1,177 @@
+"""
+    # __slots__ : compact version of the Employee / Developer / Manager hierarchy.
+    # Normally every instance stores its attributes in its own __dict__. With __slots__
+      the class lists its attribute names up front and Python keeps the values in a fixed
+      array inside the object, so there is no per-instance __dict__ at all.
+    # Every class in the hierarchy has to declare __slots__ (only the *new* names),
+      otherwise a subclass gets a __dict__ back and the saving is lost.
+    # Class attributes still work as before: raise_amt is looked up on the class, so
+      Developer can override it and set_raise_amt() changes it for the whole class.
+      What does not work is giving one instance its own raise_amt (emp.raise_amt = 1.2
+      raises AttributeError), because raise_amt is not a slot.
+    # The compact classes are opt-in; the dict-based ones below are unchanged.
+"""
+
+
+class Employee:
+
+    raise_amt = 1.04
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.email = first + '.' + last + '@email.com'
+        self.pay = pay
+
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+
+    @classmethod
+    def set_raise_amt(cls, amount):
+        cls.raise_amt = amount
+
+    @classmethod
+    def from_string(cls, emp_str):
+        first, last, pay = emp_str.split('-')
+        return cls(first, last, int(pay))
+
+
+class Developer(Employee):
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = prog_lang
+
+
+class Manager(Employee):
+
+    def __init__(self, first, last, pay, employees=None):
+        super().__init__(first, last, pay)
+        self.employees = dict.fromkeys(employees or ())
+
+    def add_emp(self, emp):
+        self.employees[emp] = None
+
+    def remove_emp(self, emp):
+        self.employees.pop(emp, None)
+
+    def iter_emps(self):
+        yield from self.employees
+
+
+class CompactEmployee:
+
+    __slots__ = ('first', 'last', 'email', 'pay')
+
+    raise_amt = 1.04
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.email = first + '.' + last + '@email.com'
+        self.pay = pay
+
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+
+    @classmethod
+    def set_raise_amt(cls, amount):
+        cls.raise_amt = amount
+
+    @classmethod
+    def from_string(cls, emp_str):
+        first, last, pay = emp_str.split('-')
+        return cls(first, last, int(pay))
+
+
+class CompactDeveloper(CompactEmployee):
+
+    __slots__ = ('prog_lang',)
+
+    raise_amt = 1.10
+
+    def __init__(self, first, last, pay, prog_lang):
+        super().__init__(first, last, pay)
+        self.prog_lang = prog_lang
+
+
+class CompactManager(CompactEmployee):
+
+    __slots__ = ('employees',)
+
+    def __init__(self, first, last, pay, employees=None):
+        super().__init__(first, last, pay)
+        self.employees = dict.fromkeys(employees or ())
+
+    def add_emp(self, emp):
+        self.employees[emp] = None
+
+    def remove_emp(self, emp):
+        self.employees.pop(emp, None)
+
+    def iter_emps(self):
+        yield from self.employees
+
+
+def measure(make, n):
+    """Return (bytes per instance, seconds per instance) for building n objects with make(i)."""
+    import gc
+    import tracemalloc
+    from time import perf_counter
+
+    names = [str(i) for i in range(n)]   # allocated up front so only the objects are counted
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [make(name) for name in names]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding the objects is not part of the per-instance cost
+    per_instance = (after - before - objs.__sizeof__()) / n
+    del objs
+
+    # construction time is measured separately, without tracemalloc's overhead
+    start = perf_counter()
+    objs = [make(name) for name in names]
+    elapsed = perf_counter() - start
+    return per_instance, elapsed / n
+
+
+def benchmark(n=100_000):
+    cases = [
+        ('Employee', lambda i: Employee('Test', i, 50000),
+         lambda i: CompactEmployee('Test', i, 50000)),
+        ('Developer', lambda i: Developer('Test', i, 50000, 'Python'),
+         lambda i: CompactDeveloper('Test', i, 50000, 'Python')),
+        ('Manager', lambda i: Manager('Test', i, 90000),
+         lambda i: CompactManager('Test', i, 90000)),
+    ]
+    print("{:,} instances each".format(n))
+    print("{:<10} {:>14} {:>14} {:>12} {:>12}".format('class', 'dict bytes', 'slots bytes', 'dict ns', 'slots ns'))
+    for name, make_dict, make_slots in cases:
+        dict_bytes, dict_time = measure(make_dict, n)
+        slots_bytes, slots_time = measure(make_slots, n)
+        print("{:<10} {:>14.1f} {:>14.1f} {:>12.0f} {:>12.0f}".format(
+            name, dict_bytes, slots_bytes, dict_time * 1e9, slots_time * 1e9))
+
+
+if __name__ == '__main__':
+    dev_1 = CompactDeveloper('Corey', 'Schafer', 50000, 'Python')
+    mgr_1 = CompactManager('Sue', 'Smith', 90000, [dev_1])
+    mgr_1.add_emp(CompactEmployee.from_string('John-Doe-70000'))
+
+    CompactEmployee.set_raise_amt(1.05)
+    for emp in mgr_1.iter_emps():
+        emp.apply_raise()
+        print(emp.fullname(), emp.raise_amt, emp.pay)
+
+    print(hasattr(dev_1, '__dict__'))
+
+    benchmark()
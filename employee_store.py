@@ -0,0 +1,245 @@
+"""
+    # Columnar storage for Employee objects.
+    # In Inheritance-3.py every Employee is its own object with a __dict__, and
+      apply_raise() is one Python method call per person. For a payroll of
+      millions of employees most of the time goes into attribute lookups.
+    # EmployeeStore keeps first, last and pay as columns (one list / array per field)
+      instead of one object per row. A raise is applied to a whole slice at once.
+    # The raise rate is still taken from the class (Employee.raise_amt,
+      Developer.raise_amt, ...), so class-level overrides and set_raise_amt() keep working.
+    # store[i] hands back a small EmployeeView that reads and writes the columns,
+      so code written against Employee (fullname(), email, apply_raise()) still works.
+    # NumPy is used for the vectorized raise when it is installed, otherwise
+      the store falls back to the standard library `array` module.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Employee:
+
+    raise_amt = 1.04
+
+    def __init__(self, first, last, pay):
+        self.first = first
+        self.last = last
+        self.email = first + '.' + last + '@email.com'
+        self.pay = pay
+
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+
+
+class Developer(Employee):
+    raise_amt = 1.10
+
+
+class EmployeeView:
+    """
+    Lightweight Employee look-alike backed by one row of an EmployeeStore.
+    """
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    @property
+    def emp_class(self):
+        return self._store._classes[self._store._kinds[self._index]]
+
+    @property
+    def first(self):
+        return self._store._first[self._index]
+
+    @property
+    def last(self):
+        return self._store._last[self._index]
+
+    @property
+    def pay(self):
+        return self._store._pay[self._index]
+
+    @pay.setter
+    def pay(self, value):
+        self._store._pay[self._index] = value
+
+    @property
+    def raise_amt(self):
+        return self.emp_class.raise_amt
+
+    @property
+    def email(self):
+        return self.first + '.' + self.last + '@email.com'
+
+    def fullname(self):
+        return '{} {}'.format(self.first, self.last)
+
+    def apply_raise(self):
+        self.pay = int(self.pay * self.raise_amt)
+
+    def to_employee(self):
+        """Materialize a real Employee (or subclass) object from this row."""
+        return self.emp_class(self.first, self.last, self.pay)
+
+    def __repr__(self):
+        return "{}View({!r}, {!r}, {})".format(self.emp_class.__name__, self.first, self.last, self.pay)
+
+
+class EmployeeStore:
+    """
+    Holds employees as columns: first, last, pay and the employee class of each row.
+    """
+
+    def __init__(self):
+        self._first = []
+        self._last = []
+        self._pay = array('q')
+        self._kinds = array('B')   # index into self._classes
+        self._classes = []
+        self._class_codes = {}
+
+    def _code_for(self, emp_class):
+        code = self._class_codes.get(emp_class)
+        if code is None:
+            if len(self._classes) == 256:
+                raise ValueError("EmployeeStore supports at most 256 employee classes")
+            code = len(self._classes)
+            self._classes.append(emp_class)
+            self._class_codes[emp_class] = code
+        return code
+
+    def append(self, first, last, pay, emp_class=Employee):
+        # everything that can fail runs before any column changes, so they stay the same length
+        pay = int(pay)
+        code = self._code_for(emp_class)
+        self._pay.append(pay)
+        self._kinds.append(code)
+        self._first.append(first)
+        self._last.append(last)
+        return len(self._first) - 1
+
+    def extend(self, rows, emp_class=Employee):
+        """Add many (first, last, pay) rows of the same class at once, or none if a row is bad."""
+        code = self._code_for(emp_class)
+        firsts = []
+        lasts = []
+        pays = array('q')
+        for first, last, pay in rows:
+            firsts.append(first)
+            lasts.append(last)
+            pays.append(int(pay))
+        self._pay.extend(pays)
+        self._kinds.extend(array('B', [code]) * len(pays))
+        self._first.extend(firsts)
+        self._last.extend(lasts)
+
+    @classmethod
+    def from_employees(cls, employees):
+        store = cls()
+        for emp in employees:
+            store.append(emp.first, emp.last, emp.pay, type(emp))
+        return store
+
+    def __len__(self):
+        return len(self._first)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EmployeeStore index out of range")
+        return EmployeeView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield EmployeeView(self, index)
+
+    def apply_raise(self, start=0, stop=None):
+        """
+        Apply each row's class raise_amt to the rows in [start, stop).
+        The rates are read from the classes at call time.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        if start >= stop:
+            return
+        rates = [emp_class.raise_amt for emp_class in self._classes]
+        if np is not None:
+            self._apply_raise_numpy(start, stop, rates)
+        else:
+            self._apply_raise_array(start, stop, rates)
+
+    def _apply_raise_numpy(self, start, stop, rates):
+        # frombuffer gives zero-copy views on the array('q') / array('B') columns
+        pay = np.frombuffer(self._pay, dtype=np.int64)[start:stop]
+        if len(rates) == 1:
+            pay[:] = pay * rates[0]
+        else:
+            kinds = np.frombuffer(self._kinds, dtype=np.uint8)[start:stop]
+            pay[:] = pay * np.asarray(rates, dtype=np.float64)[kinds]
+        # release the buffer exports so the columns can grow again
+        del pay
+
+    def _apply_raise_array(self, start, stop, rates):
+        pay = self._pay
+        if len(rates) == 1:
+            rate = rates[0]
+            pay[start:stop] = array('q', [int(p * rate) for p in pay[start:stop]])
+        else:
+            pay[start:stop] = array('q', [int(p * rates[k])
+                                          for p, k in zip(pay[start:stop], self._kinds[start:stop])])
+
+
+def benchmark(n=1_000_000):
+    from time import perf_counter
+
+    objects = [Developer('Test', str(i), 50000 + i) if i % 4 == 0 else Employee('Test', str(i), 50000 + i)
+               for i in range(n)]
+    store = EmployeeStore.from_employees(objects)
+
+    start = perf_counter()
+    for emp in objects:
+        emp.apply_raise()
+    loop_time = perf_counter() - start
+
+    start = perf_counter()
+    store.apply_raise()
+    store_time = perf_counter() - start
+
+    assert [emp.pay for emp in objects[:1000]] == list(store._pay[:1000])
+    backend = 'numpy' if np is not None else 'array'
+    print("{:,} employees".format(n))
+    print("  Employee.apply_raise() loop : {:.4f} s".format(loop_time))
+    print("  EmployeeStore.apply_raise() : {:.4f} s ({}, {:.1f}x)".format(store_time, backend, loop_time / store_time))
+
+
+if __name__ == '__main__':
+    store = EmployeeStore()
+    store.append('Corey', 'Schafer', 50000)
+    store.append('Test', 'Employee', 60000, Developer)
+
+    store.apply_raise()
+    for emp in store:
+        print(emp, emp.email)
+
+    Developer.raise_amt = 1.20
+    store[1].apply_raise()
+    print(store[1].to_employee().pay)
+
+    benchmark()
+
+"""
+EmployeeView('Corey', 'Schafer', 52000) Corey.Schafer@email.com
+DeveloperView('Test', 'Employee', 66000) Test.Employee@email.com
+79200
+1,000,000 employees
+  Employee.apply_raise() loop : 0.3258 s
+  EmployeeStore.apply_raise() : 0.0154 s (numpy, 21.1x)
+"""
@@ -0,0 +1,239 @@
+"""
+    # Fusing a stack of decorators into one wrapper.
+    # Every decorator in this repo (my_decorator, double, Timer, ErrorCheck, SquareDecorator)
+      adds its own wrapper: one more Python frame and one more *args/**kwargs repack per layer.
+      With 4-6 layers on a hot function that overhead is bigger than the function itself.
+    # Most of those decorators only do one of a few simple things, so they can be described
+      as stages instead of wrappers:
+        * Before(hook)       : hook(*args, **kwargs) runs before the call   (my_decorator, ErrorCheck)
+        * After(hook)        : hook(result) runs after the call             (SquareDecorator's print)
+        * Transform(fn)      : the result is replaced by fn(result)         (double)
+        * Around(enter, exit): token = enter() before, exit(token, result) after   (Timer)
+    # fuse(stage1, stage2, ...) works like stacking @stage1 @stage2 ... on top of each other
+      (stage1 is the outermost), but generates the source of ONE wrapper that calls all the
+      hooks inline. When the wrapped function has a normal signature and there is no Before
+      stage, the wrapper gets the same fixed parameter list, e.g. `def adder(a, b)`, so no
+      *args/**kwargs tuple/dict is built. With a Before stage the wrapper takes *args/**kwargs,
+      so the hook sees the call exactly as it was made, as it would with nested decorators.
+    # Every stage can also be used on its own as a classic (nested) decorator, which is what
+      the benchmark compares against.
+"""
+import inspect
+from functools import update_wrapper, wraps
+
+
+class Before:
+    def __init__(self, hook):
+        self.hook = hook
+
+    def __call__(self, func):
+        hook = self.hook
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            hook(*args, **kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+
+
+class After:
+    def __init__(self, hook):
+        self.hook = hook
+
+    def __call__(self, func):
+        hook = self.hook
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            hook(result)
+            return result
+        return wrapper
+
+
+class Transform:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, func):
+        fn = self.fn
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return fn(func(*args, **kwargs))
+        return wrapper
+
+
+class Around:
+    def __init__(self, enter, exit):
+        self.enter = enter
+        self.exit = exit
+
+    def __call__(self, func):
+        enter, exit = self.enter, self.exit
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            token = enter()
+            result = func(*args, **kwargs)
+            exit(token, result)
+            return result
+        return wrapper
+
+
+def _signature_source(func, namespace):
+    """
+    (parameter list, argument list) reproducing func's signature, or the generic
+    ('*args, **kwargs', '*args, **kwargs') when it can't be read.
+    """
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        return '*_f_args, **_f_kwargs', '*_f_args, **_f_kwargs'
+
+    params = []
+    call = []
+    star = False
+    positional_only = False
+    for index, param in enumerate(sig.parameters.values()):
+        name = param.name
+        if param.kind == param.POSITIONAL_ONLY:
+            positional_only = True
+        elif positional_only:
+            params.append('/')
+            positional_only = False
+
+        if param.kind == param.VAR_POSITIONAL:
+            star = True
+            params.append('*' + name)
+            call.append('*' + name)
+        elif param.kind == param.VAR_KEYWORD:
+            params.append('**' + name)
+            call.append('**' + name)
+        else:
+            text = name
+            if param.default is not param.empty:
+                namespace['_f_default_{}'.format(index)] = param.default
+                text += '=_f_default_{}'.format(index)
+            if param.kind == param.KEYWORD_ONLY:
+                if not star:
+                    params.append('*')
+                    star = True
+                call.append('{0}={0}'.format(name))
+            else:
+                call.append(name)
+            params.append(text)
+    if positional_only:
+        params.append('/')
+    return ', '.join(params), ', '.join(call)
+
+
+def fuse(*stages):
+    """
+    @fuse(Before(check), Around(start, stop), Transform(double)) is equivalent to
+    stacking @Before(check) @Around(start, stop) @Transform(double), in one frame.
+    """
+    def decorator(func):
+        namespace = {'_f_func': func}
+        if any(isinstance(stage, Before) for stage in stages):
+            # a fixed parameter list would hand Before hooks the defaults and keywords
+            # filled in, so pass the arguments through as they were given
+            params = call = '*_f_args, **_f_kwargs'
+        else:
+            params, call = _signature_source(func, namespace)
+        enter_lines = []
+        exit_lines = []
+        for index, stage in enumerate(stages):
+            if isinstance(stage, Before):
+                namespace['_f_before_{}'.format(index)] = stage.hook
+                enter_lines.append('_f_before_{}({})'.format(index, call))
+            elif isinstance(stage, After):
+                namespace['_f_after_{}'.format(index)] = stage.hook
+                exit_lines.append('_f_after_{}(_f_result)'.format(index))
+            elif isinstance(stage, Transform):
+                namespace['_f_transform_{}'.format(index)] = stage.fn
+                exit_lines.append('_f_result = _f_transform_{}(_f_result)'.format(index))
+            elif isinstance(stage, Around):
+                namespace['_f_enter_{}'.format(index)] = stage.enter
+                namespace['_f_exit_{}'.format(index)] = stage.exit
+                enter_lines.append('_f_token_{0} = _f_enter_{0}()'.format(index))
+                exit_lines.append('_f_exit_{0}(_f_token_{0}, _f_result)'.format(index))
+            else:
+                raise TypeError("fuse() takes Before/After/Transform/Around stages, got {!r}".format(stage))
+
+        # the innermost stage unwinds first, like nested decorators
+        body = enter_lines + ['_f_result = _f_func({})'.format(call)] + exit_lines[::-1] + ['return _f_result']
+        name = func.__name__ if func.__name__.isidentifier() else 'wrapper'
+        source = 'def {}({}):\n    {}\n'.format(name, params, '\n    '.join(body))
+        exec(source, namespace)
+        wrapper = update_wrapper(namespace[name], func)
+        wrapper._f_source = source
+        return wrapper
+    return decorator
+
+
+def benchmark(depths=range(1, 9), calls=200_000):
+    from time import perf_counter
+
+    def adder(a, b):
+        return a + b
+
+    def noop(*args, **kwargs):
+        pass
+
+    def identity(result):
+        return result
+
+    def make_stages(depth, kinds):
+        return [kinds[i % len(kinds)]() for i in range(depth)]
+
+    stacks = {
+        # a Before stage makes fuse() take *args/**kwargs
+        'with Before': [lambda: Before(noop), lambda: Transform(identity), lambda: After(noop)],
+        # no Before stage: the fused wrapper gets adder's own (a, b) parameter list
+        'fixed arity': [lambda: Transform(identity), lambda: After(noop),
+                        lambda: Around(perf_counter, noop)],
+    }
+    for label, kinds in stacks.items():
+        print(label)
+        print("{:>6} {:>14} {:>14} {:>9}".format('depth', 'nested', 'fused', 'speedup'))
+        for depth in depths:
+            stages = make_stages(depth, kinds)
+            nested = adder
+            for stage in reversed(stages):
+                nested = stage(nested)
+            fused = fuse(*stages)(adder)
+            assert nested(1, 2) == fused(1, 2) == 3
+
+            timings = []
+            for func in (nested, fused):
+                start = perf_counter()
+                for i in range(calls):
+                    func(i, 1)
+                timings.append((perf_counter() - start) / calls * 1e9)
+            print("{:>6} {:>11.0f} ns {:>11.0f} ns {:>8.1f}x".format(
+                depth, timings[0], timings[1], timings[0] / timings[1]))
+
+
+if __name__ == '__main__':
+    from time import perf_counter
+
+    def error_check(*params):
+        if any(isinstance(i, str) for i in params):
+            raise TypeError("parameter cannot be a string !!")
+
+    @fuse(
+        Before(lambda a, b: print("This happened before!")),                 # my_decorator
+        Around(perf_counter, lambda start, result: print(
+            "Execution took {:.6f} seconds".format(perf_counter() - start))),  # Timer
+        Before(error_check),                                                   # ErrorCheck
+        After(print),                                                          # SquareDecorator
+        Transform(lambda result: 2 * result),                                  # double
+    )
+    def adder(a, b):
+        return a + b
+
+    print(adder(10, 20))
+    print(adder._f_source)
+
+    benchmark()
@@ -0,0 +1,215 @@
+"""
+    # Thread-safe instance counting.
+    # `Employee.num_of_emps += 1` is a read-modify-write of a class attribute: two threads
+      can read the same old value and one of the increments is lost.
+    # Putting a global Lock around it fixes the count but makes every constructor in every
+      thread wait on the same lock.
+    # ShardedCounter gives every thread its own counter cell (a shard). A thread only ever
+      writes to its own cell, so increments need no lock; reading the value adds up all cells.
+    # InstanceRegistry keeps weak references to the live instances of a class (again one
+      shard per thread), so it can tell how many objects are still alive without keeping
+      them alive. Classes using __slots__ need a '__weakref__' slot to be registered.
+      Instances are told apart by identity, so objects that compare equal, or unhashable
+      ones (e.g. dataclasses), are each counted once.
+    # When a thread exits, its shard is folded into a shared one, so programs that start a
+      thread per task don't collect shards without bound.
+    # A ShardedCounter behaves like the int it replaces: it compares and adds like an int, and
+      `counter += 1` increments it in place.
+"""
+import threading
+import weakref
+from functools import total_ordering
+
+
+class _ThreadExit:
+    """Stored in a threading.local: it is freed when its thread exits."""
+    __slots__ = ('__weakref__',)
+
+
+@total_ordering
+class ShardedCounter:
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells = {}                # id(cell) -> cell; equal cells are still different shards
+        self._retired = 0               # counts of threads that have exited
+        self._lock = threading.Lock()   # not taken by increment() after a thread's first call
+
+    def _cell(self):
+        cell = [0]
+        with self._lock:
+            self._cells[id(cell)] = cell
+        self._local.cell = cell
+        self._local.exit = _ThreadExit()
+        weakref.finalize(self._local.exit, self._retire, cell)
+        return cell
+
+    def _retire(self, cell):
+        with self._lock:
+            self._retired += cell[0]
+            del self._cells[id(cell)]
+
+    def increment(self, amount=1):
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cell()
+        cell[0] += amount
+
+    @property
+    def value(self):
+        with self._lock:
+            return self._retired + sum(cell[0] for cell in self._cells.values())
+
+    def __iadd__(self, amount):
+        self.increment(amount)
+        return self
+
+    def __index__(self):
+        return self.value
+
+    __int__ = __index__
+    __hash__ = None
+
+    def __eq__(self, other):
+        return self.value == other
+
+    def __lt__(self, other):
+        return self.value < other
+
+    def __add__(self, other):
+        return self.value + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.value - other
+
+    def __rsub__(self, other):
+        return other - self.value
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return 'ShardedCounter({})'.format(self.value)
+
+
+class InstanceRegistry:
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = {}               # id(refs) -> refs, by identity like _cells
+        self._retired = {}              # live instances registered by threads that have exited
+        self._lock = threading.Lock()   # only taken the first time a thread registers
+
+    def _shard(self):
+        refs = {}
+        with self._lock:
+            self._shards[id(refs)] = refs
+        self._local.refs = refs
+        self._local.exit = _ThreadExit()
+        weakref.finalize(self._local.exit, self._retire, refs)
+        return refs
+
+    def _retire(self, refs):
+        with self._lock:
+            del self._shards[id(refs)]
+            for ref in list(refs.values()):
+                obj = ref()
+                if obj is not None:
+                    self._add(self._retired, obj)
+            refs.clear()
+
+    @staticmethod
+    def _add(refs, obj):
+        key = id(obj)
+
+        def forget(ref):
+            # the weakref removes itself from its shard when obj is garbage collected
+            if refs.get(key) is ref:
+                del refs[key]
+
+        refs[key] = weakref.ref(obj, forget)
+
+    def register(self, obj):
+        try:
+            refs = self._local.refs
+        except AttributeError:
+            refs = self._shard()
+        self._add(refs, obj)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._retired) + sum(len(refs) for refs in self._shards.values())
+
+    def __iter__(self):
+        with self._lock:
+            refs = [ref for shard in [*self._shards.values(), self._retired] for ref in list(shard.values())]
+        for ref in refs:
+            obj = ref()
+            if obj is not None:
+                yield obj
+
+
+def benchmark(thread_counts=(1, 2, 4, 8, 16, 32), total=400_000):
+    from time import perf_counter
+
+    class Plain:
+        count = 0
+
+        def __init__(self):
+            Plain.count += 1
+
+    class Locked:
+        count = 0
+        lock = threading.Lock()
+
+        def __init__(self):
+            with Locked.lock:
+                Locked.count += 1
+
+    class Sharded:
+        count = ShardedCounter()
+
+        def __init__(self):
+            Sharded.count.increment()
+
+    class Tracked:
+        count = ShardedCounter()
+        live = InstanceRegistry()
+
+        def __init__(self):
+            Tracked.count.increment()
+            Tracked.live.register(self)
+
+    def run(cls, n_threads):
+        per_thread = total // n_threads
+        keep = []
+
+        def work():
+            objs = [cls() for _ in range(per_thread)]
+            keep.append(objs)
+
+        threads = [threading.Thread(target=work) for _ in range(n_threads)]
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return perf_counter() - start, per_thread * n_threads
+
+    print("{:>7} {:>24} {:>24} {:>24} {:>24}".format(
+        'threads', 'unsynchronized', 'global lock', 'sharded', 'sharded + registry'))
+    for n_threads in thread_counts:
+        row = []
+        for cls in (Plain, Locked, Sharded, Tracked):
+            before = int(cls.count)
+            elapsed, expected = run(cls, n_threads)
+            lost = expected - (int(cls.count) - before)
+            row.append("{:>9,.0f}/s lost={:<6}".format(expected / elapsed, lost))
+        print("{:>7} {:>24} {:>24} {:>24} {:>24}".format(n_threads, *row))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,255 @@
+"""
+    # Latency histograms behind a timing decorator.
+    # Timer (class-decorator-5.py) calls time() and print() on every call. time() is too coarse
+      for short functions and print() costs far more than the function being measured.
+    # HistogramTimer times calls with perf_counter_ns() and records them into a per-function
+      histogram instead of printing. The histogram is HDR-style: values are kept in
+      log-linear buckets (2**PRECISION_BITS buckets per power of two), so the relative error
+      of a reported percentile stays around 3% whether calls take 100ns or 100s.
+    # Every thread records into its own bucket array (no lock on the hot path); a snapshot adds
+      the per-thread arrays together. When a thread exits, its array is added into a shared one,
+      so starting a thread per task doesn't grow the list of arrays.
+    # sample_every=N only times one call in N; the other calls go straight to the function.
+    # snapshot() / snapshot_json() export count, max, mean and p50/p99/p999 for every timed function.
+"""
+import json
+import threading
+import weakref
+from functools import update_wrapper
+from time import perf_counter_ns
+from types import MethodType
+
+PRECISION_BITS = 5
+_SUB_BUCKETS = 1 << PRECISION_BITS
+_HALF = _SUB_BUCKETS >> 1
+_N_BUCKETS = _SUB_BUCKETS + 64 * _HALF
+
+
+def bucket_index(value):
+    bits = value.bit_length()
+    if bits <= PRECISION_BITS:
+        return value
+    shift = bits - PRECISION_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def bucket_value(index):
+    """Midpoint of the values that fall into bucket `index`."""
+    if index < _SUB_BUCKETS:
+        return index
+    shift, mantissa = divmod(index - _SUB_BUCKETS, _HALF)
+    shift += 1
+    low = (mantissa + _HALF) << shift
+    return low + ((1 << shift) - 1) // 2
+
+
+def _new_shard():
+    # [calls, bucket counts, total ns, max ns]
+    return [0, [0] * _N_BUCKETS, 0, 0]
+
+
+class _ThreadExit:
+    """Stored in a threading.local: it is freed when its thread exits."""
+    __slots__ = ('__weakref__',)
+
+
+class LatencyHistogram:
+
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()
+        self._shards = {}               # id(shard) -> shard; equal shards are still different threads
+        self._retired = _new_shard()    # shards of threads that have exited, added together
+        self._lock = threading.Lock()   # only taken the first time a thread records
+
+    def _shard(self):
+        shard = _new_shard()
+        with self._lock:
+            self._shards[id(shard)] = shard
+        self._local.shard = shard
+        self._local.exit = _ThreadExit()
+        weakref.finalize(self._local.exit, self._retire, shard)
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            del self._shards[id(shard)]
+            retired = self._retired
+            retired[0] += shard[0]
+            counts = retired[1]
+            for index, count in enumerate(shard[1]):
+                if count:
+                    counts[index] += count
+            retired[2] += shard[2]
+            retired[3] = max(retired[3], shard[3])
+
+    def shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self._shard()
+
+    def record(self, elapsed_ns):
+        shard = self.shard()
+        shard[1][bucket_index(elapsed_ns)] += 1
+        shard[2] += elapsed_ns
+        if elapsed_ns > shard[3]:
+            shard[3] = elapsed_ns
+
+    def snapshot(self, percentiles=(50, 99, 99.9)):
+        counts = [0] * _N_BUCKETS
+        calls = total = maximum = 0
+        with self._lock:
+            for shard in [*self._shards.values(), self._retired]:
+                calls += shard[0]
+                for index, count in enumerate(shard[1]):
+                    if count:
+                        counts[index] += count
+                total += shard[2]
+                maximum = max(maximum, shard[3])
+        recorded = sum(counts)
+
+        result = {'calls': calls, 'count': recorded, 'max_ns': maximum,
+                  'mean_ns': total / recorded if recorded else 0.0}
+        for p in percentiles:
+            key = 'p{}'.format(str(p).replace('.', ''))
+            result[key + '_ns'] = self._percentile(counts, recorded, p, maximum)
+        return result
+
+    @staticmethod
+    def _percentile(counts, recorded, p, maximum):
+        if not recorded:
+            return 0
+        rank = max(1, -(-recorded * p // 100))   # ceil
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_value(index), maximum)
+        return maximum
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(name):
+    histogram = _histograms.get(name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(name, LatencyHistogram(name))
+    return histogram
+
+
+def snapshot():
+    return {name: histogram.snapshot() for name, histogram in list(_histograms.items())}
+
+
+def snapshot_json(**kwargs):
+    return json.dumps(snapshot(), **kwargs)
+
+
+class HistogramTimer:
+
+    def __init__(self, function, sample_every=1, name=None):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1, got {!r}".format(sample_every))
+        update_wrapper(self, function)
+        self.function = function
+        self.sample_every = sample_every
+        self.histogram = get_histogram(name or '{}.{}'.format(function.__module__, function.__qualname__))
+        self._local = self.histogram._local
+
+    def __call__(self, *args, **kwargs):
+        # hot path: everything inlined, no lock, no method calls besides the clock
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self.histogram.shard()
+        calls = shard[0] = shard[0] + 1
+        if calls % self.sample_every:
+            return self.function(*args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            bits = elapsed.bit_length()
+            if bits <= PRECISION_BITS:
+                shard[1][elapsed] += 1
+            else:
+                shift = bits - PRECISION_BITS
+                shard[1][_SUB_BUCKETS + (shift - 1) * _HALF + (elapsed >> shift) - _HALF] += 1
+            shard[2] += elapsed
+            if elapsed > shard[3]:
+                shard[3] = elapsed
+
+    def __get__(self, instance, owner=None):
+        # so the decorator also works on methods
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+
+def timed(function=None, *, sample_every=1, name=None):
+    """
+    @timed or @timed(sample_every=100, name='payroll.apply_raise')
+    """
+    if function is None:
+        return lambda f: HistogramTimer(f, sample_every, name)
+    return HistogramTimer(function, sample_every, name)
+
+
+def benchmark(calls=200_000):
+    import contextlib
+    import io
+    from time import time
+
+    class Timer:
+        # the print-based Timer from class-decorator-5.py
+        def __init__(self, func):
+            self.function = func
+
+        def __call__(self, *args, **kwargs):
+            start_time = time()
+            result = self.function(*args, **kwargs)
+            end_time = time()
+            print("Execution took {} seconds".format(end_time - start_time))
+            return result
+
+    def work(x):
+        return x + 1
+
+    cases = [
+        ('undecorated', work),
+        ('Timer (print)', Timer(work)),
+        ('timed', timed(work, name='bench.timed')),
+        ('timed sample 1/100', timed(work, sample_every=100, name='bench.sampled')),
+    ]
+    baseline = None
+    print("{:,} calls".format(calls))
+    for label, func in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = perf_counter_ns()
+            for i in range(calls):
+                func(i)
+            per_call = (perf_counter_ns() - start) / calls
+        if baseline is None:
+            baseline = per_call
+        print("  {:<20} {:>8.0f} ns/call  (+{:.0f} ns overhead)".format(label, per_call, per_call - baseline))
+    print(snapshot_json(indent=2))
+
+
+if __name__ == '__main__':
+    from time import sleep
+
+    @timed
+    def some_function(delay):
+        sleep(delay)
+
+    for _ in range(20):
+        some_function(0.001)
+    some_function(0.05)
+
+    print(snapshot()['__main__.some_function'])
+    benchmark()
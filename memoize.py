@@ -0,0 +1,192 @@
+"""
+    # Memoization with a class decorator.
+    # SquareDecorator (class-decorator-4.py) and double (decorator-7.py) wrap pure functions,
+      so calling them again with the same arguments always gives the same result.
+      Memoize remembers those results instead of recomputing them.
+    # Like the other class decorators in this repo, the work happens in __call__.
+    # Options:
+        * maxsize : keep at most this many results; the least recently used one is
+                    evicted first (LRU). None means unbounded.
+        * ttl     : results older than ttl seconds are recomputed.
+        * typed   : f(3) and f(3.0) are cached separately.
+    # Thread safety: the lock only protects the cache dictionary, it is never held while the
+      wrapped function runs. If several threads ask for the same missing key at once, one
+      of them computes it and the others wait for that result instead of recomputing it.
+    # cache_info() reports hits, misses, waits, evictions, expirations, size and (shallow)
+      memory use. A call that waited for another thread's result counts as a wait, not a
+      miss, so misses is the number of times the function actually ran.
+"""
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+from time import monotonic
+from types import MethodType
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses waits evictions expirations maxsize currsize memory')
+
+_KWARGS_MARK = object()
+_FAST_TYPES = {int, str}
+
+
+class _Pending:
+    """
+    A result that another thread is still computing. `done` is a lock that is held
+    until the result is ready (cheaper to create than a threading.Event).
+    """
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Lock()
+        self.done.acquire()
+        self.value = None
+        self.error = None
+
+
+class Memoize:
+
+    def __init__(self, function, maxsize=128, ttl=None, typed=False):
+        update_wrapper(self, function)
+        self.function = function
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.typed = typed
+        self._cache = OrderedDict()   # key -> (value, expires_at, size)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._waits = self._evictions = self._expirations = self._memory = 0
+
+    def _make_key(self, args, kwargs):
+        if not kwargs and not self.typed and len(args) == 1 and type(args[0]) in _FAST_TYPES:
+            return args[0]
+        key = args
+        if kwargs:
+            key += (_KWARGS_MARK,) + tuple(kwargs.items())
+        if self.typed:
+            key += tuple(type(v) for v in args)
+            if kwargs:
+                key += tuple(type(v) for v in kwargs.values())
+        return key
+
+    def __call__(self, *args, **kwargs):
+        key = self._make_key(args, kwargs)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                if entry[1] is None or entry[1] > monotonic():
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return entry[0]
+                self._remove(key)
+                self._expirations += 1
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                self._misses += 1
+            else:
+                self._waits += 1
+
+        if not owner:
+            with pending.done:
+                pass
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            value = self.function(*args, **kwargs)
+        except BaseException as error:
+            pending.error = error
+            with self._lock:
+                del self._pending[key]
+            pending.done.release()
+            raise
+
+        pending.value = value
+        expires_at = monotonic() + self.ttl if self.ttl is not None else None
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        with self._lock:
+            del self._pending[key]
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = (value, expires_at, size)
+            self._memory += size
+            if self.maxsize is not None:
+                while len(self._cache) > self.maxsize:
+                    self._remove(next(iter(self._cache)))
+                    self._evictions += 1
+        pending.done.release()
+        return value
+
+    def _remove(self, key):
+        self._memory -= self._cache.pop(key)[2]
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._waits, self._evictions, self._expirations,
+                             self.maxsize, len(self._cache), self._memory)
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = self._waits = self._evictions = self._expirations = self._memory = 0
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+
+def memoize(function=None, *, maxsize=128, ttl=None, typed=False):
+    """
+    @memoize or @memoize(maxsize=1024, ttl=60, typed=True)
+    """
+    if function is None:
+        return lambda f: Memoize(f, maxsize, ttl, typed)
+    return Memoize(function, maxsize, ttl, typed)
+
+
+def benchmark(calls=200_000):
+    import random
+    from functools import lru_cache
+    from time import perf_counter
+
+    def get_square(n):
+        return sum(i * i for i in range(200 + n % 50))
+
+    random.seed(1)
+    workloads = {
+        'hit-heavy': [random.randrange(100) for _ in range(calls)],
+        'miss-heavy': [random.randrange(10 ** 9) for _ in range(calls)],
+    }
+    for workload, keys in workloads.items():
+        print(workload)
+        for label, func in (('uncached', get_square),
+                            ('Memoize(maxsize=1024)', Memoize(get_square, maxsize=1024)),
+                            ('functools.lru_cache', lru_cache(maxsize=1024)(get_square))):
+            start = perf_counter()
+            for key in keys:
+                func(key)
+            elapsed = perf_counter() - start
+            print("  {:<22} {:>10,.0f} calls/sec".format(label, calls / elapsed))
+            if isinstance(func, Memoize):
+                print("  {:<22} {}".format('', func.cache_info()))
+
+
+if __name__ == '__main__':
+    @memoize
+    def get_square(n):
+        print("given number is:", n)
+        return n * n
+
+    @memoize(maxsize=2, ttl=0.05)
+    def adder(a, b):
+        return 2 * (a + b)
+
+    print(get_square(195), get_square(195))
+    print(adder(10, 20), adder(10, 20), adder(6, 1), adder(1, 1))
+    print(get_square.cache_info())
+    print(adder.cache_info())
+
+    benchmark()
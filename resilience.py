@@ -0,0 +1,320 @@
+"""
+    # Retries, backoff and a circuit breaker: a grown-up version of handle_exceptions
+      (decorator-5.py), which swallows every exception and returns None.
+    # Resilient(function, ...) / @resilient(...) calls the function and, when it raises
+      one of the `retry_on` exceptions:
+        * retries it up to `retries` more times,
+        * waits between attempts with exponential backoff and full jitter:
+          a random delay between 0 and min(max_backoff, backoff * 2 ** attempt),
+          so many callers that failed together don't all retry at the same moment,
+        * re-raises the last error when the retries are used up (nothing is swallowed).
+    # CircuitBreaker watches the last `window` calls. Once at least `min_calls` were made and
+      the failure rate reaches `failure_rate`, the circuit opens: calls fail fast with
+      CircuitOpenError instead of hammering a callee that is already struggling. After
+      `reset_timeout` seconds one trial call is let through (half-open); if it succeeds the
+      circuit closes again, otherwise it stays open for another reset_timeout. A trial that is
+      cancelled or interrupted gives no verdict, so the next call becomes the trial.
+    # `async def` functions get an asyncio variant that awaits the call and uses asyncio.sleep.
+    # stats() returns the calls / successes / failures / retries / short_circuits counters.
+    # self_check() asserts this behaviour with FlakyService and a fake clock.
+"""
+import asyncio
+import inspect
+import random
+import threading
+import time
+from collections import deque
+from functools import update_wrapper
+from types import MethodType
+
+from instance_counter import ShardedCounter
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_rate=0.5, window=20, min_calls=10, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self._results = deque(maxlen=window)   # True for a failed call
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record(self, failed):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self.state = self.CLOSED
+                    self._results.clear()
+                    self._failures = 0
+                return
+            if len(self._results) == self._results.maxlen:
+                self._failures -= self._results[0]
+            self._results.append(failed)
+            self._failures += failed
+            if (self.state == self.CLOSED and len(self._results) >= self.min_calls
+                    and self._failures >= self.failure_rate * len(self._results)):
+                self._open()
+
+    def abandon(self):
+        """The call allow() let through ended without a result (cancelled, interrupted)."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_running = False   # let the next call be the trial instead
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._trial_running = False
+
+
+class Resilient:
+
+    def __init__(self, function, retries=3, backoff=0.1, max_backoff=10.0, retry_on=(Exception,),
+                 breaker=None, sleep=None):
+        update_wrapper(self, function)
+        self.function = function
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_on = retry_on
+        self.breaker = breaker
+        self.is_async = inspect.iscoroutinefunction(function)
+        self.sleep = sleep or (asyncio.sleep if self.is_async else time.sleep)
+        self.calls = ShardedCounter()
+        self.successes = ShardedCounter()
+        self.failures = ShardedCounter()
+        self.retried = ShardedCounter()
+        self.short_circuits = ShardedCounter()
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _before_attempt(self):
+        if self.breaker is not None and not self.breaker.allow():
+            self.short_circuits.increment()
+            raise CircuitOpenError("circuit open for {}".format(self.__qualname__))
+
+    def _abandon_attempt(self):
+        if self.breaker is not None:
+            self.breaker.abandon()
+
+    def _after_attempt(self, error, attempt):
+        """Returns the delay before the next attempt, or raises when giving up."""
+        if self.breaker is not None:
+            self.breaker.record(error is not None)
+        if error is None:
+            self.successes.increment()
+            return None
+        if attempt >= self.retries or not isinstance(error, self.retry_on):
+            self.failures.increment()
+            raise error
+        self.retried.increment()
+        return self.delay(attempt)
+
+    def __call__(self, *args, **kwargs):
+        if self.is_async:
+            return self._call_async(args, kwargs)
+        self.calls.increment()
+        for attempt in range(self.retries + 1):
+            self._before_attempt()
+            try:
+                result = self.function(*args, **kwargs)
+            except Exception as error:
+                self.sleep(self._after_attempt(error, attempt))
+            except BaseException:
+                self._abandon_attempt()
+                raise
+            else:
+                self._after_attempt(None, attempt)
+                return result
+
+    async def _call_async(self, args, kwargs):
+        self.calls.increment()
+        for attempt in range(self.retries + 1):
+            self._before_attempt()
+            try:
+                result = await self.function(*args, **kwargs)
+            except Exception as error:
+                await self.sleep(self._after_attempt(error, attempt))
+            except BaseException:         # CancelledError, KeyboardInterrupt, ...
+                self._abandon_attempt()
+                raise
+            else:
+                self._after_attempt(None, attempt)
+                return result
+
+    def stats(self):
+        return {'calls': self.calls.value, 'successes': self.successes.value, 'failures': self.failures.value,
+                'retries': self.retried.value, 'short_circuits': self.short_circuits.value,
+                'circuit': self.breaker.state if self.breaker is not None else None}
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+
+def resilient(function=None, **options):
+    """
+    @resilient or @resilient(retries=5, backoff=0.05, breaker=CircuitBreaker())
+    """
+    if function is None:
+        return lambda f: Resilient(f, **options)
+    return Resilient(function, **options)
+
+
+class FlakyService:
+    """Local fake callee that fails with probability `failure_rate`."""
+
+    def __init__(self, failure_rate, seed=None):
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def fetch(self, key):
+        self.calls += 1
+        if self.random.random() < self.failure_rate:
+            raise ConnectionError("service unavailable")
+        return key
+
+    async def fetch_async(self, key):
+        await asyncio.sleep(0)
+        return self.fetch(key)
+
+
+def demo(failure_rates=(0.0, 0.2, 0.5, 0.9, 1.0), requests=1000):
+    print("{:>8} {:>14} {:>9} {:>9} {:>9} {:>9} {:>14}".format(
+        'fail %', 'callee calls', 'ok', 'failed', 'retries', 'fast-fail', 'circuit'))
+    for rate in failure_rates:
+        service = FlakyService(rate, seed=1)
+        fetch = Resilient(service.fetch, retries=3, backoff=0.0001, max_backoff=0.001,
+                          breaker=CircuitBreaker(failure_rate=0.6, window=50, min_calls=20, reset_timeout=0.05))
+        for i in range(requests):
+            try:
+                fetch(i)
+            except (ConnectionError, CircuitOpenError):
+                pass
+        stats = fetch.stats()
+        # every request ends exactly one way, and each callee call is a success, a retry or a final failure
+        assert stats['calls'] == requests
+        assert stats['successes'] + stats['failures'] + stats['short_circuits'] == requests
+        assert service.calls <= stats['successes'] + stats['failures'] + stats['retries']
+        if rate == 0.0:
+            assert stats['successes'] == requests and stats['circuit'] == CircuitBreaker.CLOSED
+        if rate == 1.0:
+            assert stats['successes'] == 0 and stats['short_circuits'] > 0
+        print("{:>8.0%} {:>14} {:>9} {:>9} {:>9} {:>9} {:>14}".format(
+            rate, service.calls, stats['successes'], stats['failures'], stats['retries'],
+            stats['short_circuits'], stats['circuit']))
+
+
+def self_check():
+    """Assertions for the retry and circuit-breaker behaviour, using a fake clock."""
+    now = [0.0]
+    no_sleep = lambda seconds: None
+
+    # retries until the callee succeeds
+    service = FlakyService(0.5, seed=3)
+    fetch = Resilient(service.fetch, retries=10, sleep=no_sleep)
+    assert fetch('payroll') == 'payroll' and fetch.stats()['retries'] == service.calls - 1
+
+    # gives up after `retries` and re-raises the last error instead of returning None
+    service = FlakyService(1.0)
+    fetch = Resilient(service.fetch, retries=2, sleep=no_sleep)
+    try:
+        fetch('payroll')
+    except ConnectionError:
+        pass
+    else:
+        raise AssertionError("the error was swallowed")
+    assert service.calls == 3 and fetch.stats()['failures'] == 1
+
+    # errors outside retry_on are not retried
+    fetch = Resilient(FlakyService(1.0).fetch, retries=5, retry_on=(TimeoutError,), sleep=no_sleep)
+    try:
+        fetch(1)
+    except ConnectionError:
+        pass
+    assert fetch.stats()['retries'] == 0
+
+    # the circuit opens, fails fast, lets one trial through after reset_timeout and closes again
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4, reset_timeout=10, clock=lambda: now[0])
+    service = FlakyService(1.0)
+    fetch = Resilient(service.fetch, retries=0, breaker=breaker, sleep=no_sleep)
+    for i in range(4):
+        try:
+            fetch(i)
+        except ConnectionError:
+            pass
+    assert breaker.state == CircuitBreaker.OPEN
+    try:
+        fetch(5)
+    except CircuitOpenError:
+        pass
+    assert service.calls == 4 and fetch.stats()['short_circuits'] == 1
+    now[0] += 10
+    service.failure_rate = 0.0
+    assert fetch(6) == 6 and breaker.state == CircuitBreaker.CLOSED
+
+    # a half-open trial that is cancelled doesn't leave the circuit stuck
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2, reset_timeout=10, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record(True)
+    now[0] += 10
+
+    @resilient(retries=0, breaker=breaker)
+    async def call(key):
+        if key == 'hang':
+            await asyncio.sleep(3600)
+        return key
+
+    async def cancelled_trial():
+        try:
+            await asyncio.wait_for(call('hang'), 0.01)
+        except asyncio.TimeoutError:
+            pass
+        return await call('payroll')
+
+    assert asyncio.run(cancelled_trial()) == 'payroll' and breaker.state == CircuitBreaker.CLOSED
+    print("self_check passed")
+
+
+if __name__ == '__main__':
+    self_check()
+
+    service = FlakyService(0.5, seed=3)
+
+    @resilient(retries=5, backoff=0.01)
+    async def fetch(key):
+        return await service.fetch_async(key)
+
+    print(asyncio.run(fetch('payroll')), fetch.stats())
+
+    demo()
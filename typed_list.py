@@ -0,0 +1,203 @@
+"""
+    # A typed, array-backed version of CustomList (magic_method.py).
+    # CustomList keeps a Python list of boxed ints, fills itself with one randrange() call per
+      element, and has no __iter__, so a for loop falls back to calling __getitem__ with
+      0, 1, 2, ... until IndexError.
+    # TypedList keeps the numbers unboxed in a typed buffer (an `array`, or a NumPy array when
+      NumPy is installed) and always accesses it through a memoryview:
+        * __iter__ returns the memoryview's own iterator (C code, no __getitem__ calls),
+        * obj[a:b:c] returns another TypedList sharing the same buffer (zero-copy view);
+          writing to the view writes to the original,
+        * random() fills the buffer in bulk instead of one randrange() per element,
+        * +, -, * (with a number or another TypedList) and sum/min/max run in C:
+          through NumPy when it is installed, otherwise through map()/sum()/min()/max()
+          with operator functions, so no Python-level function is called per element.
+    # The length is fixed once created (a buffer can't grow while views on it exist).
+    # Overflow depends on the backend: NumPy wraps around silently (2**62 + 2**62 gives
+      -9223372036854775808, and sum() can wrap the same way), while the `array` fallback
+      raises OverflowError. Pick a typecode wide enough for the results you expect.
+"""
+import operator
+import random
+from array import array
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _random_array(num, low, high, typecode):
+    if 0 <= low < high <= 256:
+        # Random bytes mapped onto [low, high) with bytes.translate. Bytes above the largest
+        # multiple of the span are deleted first, so every value is equally likely.
+        span = high - low
+        limit = 256 - 256 % span
+        table = bytes(low + i % span for i in range(256))
+        drop = bytes(range(limit, 256))
+        out = bytearray()
+        while len(out) < num:
+            missing = num - len(out)
+            out += random.randbytes(missing * 256 // limit + 64).translate(table, drop)
+        return array(typecode, array('B', out[:num]))
+    return array(typecode, map(random.randrange, repeat(low, num), repeat(high, num)))
+
+
+class TypedList:
+
+    def __init__(self, data=(), typecode='q'):
+        if not isinstance(data, memoryview):
+            if not isinstance(data, array) and not (np is not None and isinstance(data, np.ndarray)):
+                data = array(typecode, data)
+            data = memoryview(data)
+        self._data = data
+
+    @property
+    def typecode(self):
+        return self._data.format
+
+    @classmethod
+    def zeros(cls, num, typecode='q'):
+        if np is not None:
+            return cls(np.zeros(num, dtype=typecode))
+        return cls(array(typecode, bytes(num * array(typecode).itemsize)))
+
+    @classmethod
+    def random(cls, num, low=1, high=101, typecode='q'):
+        """num random ints in [low, high), like CustomList's randrange(1, 101) fill."""
+        if np is not None:
+            rng = np.random.default_rng(random.getrandbits(64))
+            return cls(rng.integers(low, high, num, dtype=typecode))
+        return cls(_random_array(num, low, high, typecode))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TypedList(self._data[index])
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(value, TypedList):
+            value = value._data
+        self._data[index] = value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __str__(self):
+        return str(self._data.tolist())
+
+    def __repr__(self):
+        return 'TypedList({!r})'.format(self._data.tolist())
+
+    def tolist(self):
+        return self._data.tolist()
+
+    def sum(self):
+        if np is not None:
+            return np.asarray(self._data).sum().item()
+        return sum(self._data)
+
+    def min(self):
+        if np is not None:
+            return np.asarray(self._data).min().item()
+        return min(self._data)
+
+    def max(self):
+        if np is not None:
+            return np.asarray(self._data).max().item()
+        return max(self._data)
+
+    def _elementwise(self, other, op, reflected=False):
+        if isinstance(other, TypedList):
+            if len(other) != len(self):
+                raise ValueError("TypedList lengths differ: {} and {}".format(len(self), len(other)))
+            other = other._data
+            others = other
+        else:
+            others = repeat(other, len(self))
+        if np is not None:
+            operands = np.asarray(self._data), np.asarray(other)
+            return TypedList(op(*operands[::-1] if reflected else operands))
+        typecode = 'd' if isinstance(other, float) else self.typecode
+        operands = self._data, others
+        return TypedList(array(typecode, map(op, *operands[::-1] if reflected else operands)))
+
+    def __add__(self, other):
+        return self._elementwise(other, operator.add)
+
+    def __sub__(self, other):
+        return self._elementwise(other, operator.sub)
+
+    def __mul__(self, other):
+        return self._elementwise(other, operator.mul)
+
+    def __rsub__(self, other):
+        return self._elementwise(other, operator.sub, reflected=True)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+
+def benchmark(exponents=(6, 7), list_limit=10 ** 6):
+    from time import perf_counter
+
+    class CustomList:
+        # the list-backed version from magic_method.py
+        def __init__(self, num):
+            self.my_list = [random.randrange(1, 101, 1) for _ in range(num)]
+
+        def __getitem__(self, index):
+            return self.my_list[index]
+
+        def __len__(self):
+            return len(self.my_list)
+
+    def timed(fn):
+        start = perf_counter()
+        result = fn()
+        return perf_counter() - start, result
+
+    print("backend: {}".format('numpy' if np is not None else 'array'))
+    print("{:>12} {:<11} {:>12} {:>12} {:>12}".format('elements', 'class', 'build', 'iterate', 'sum+min+max'))
+    for exponent in exponents:
+        n = 10 ** exponent
+        classes = [('TypedList', TypedList.random)]
+        if n <= list_limit:
+            classes.insert(0, ('CustomList', CustomList))
+        for name, build in classes:
+            build_time, obj = timed(lambda: build(n))
+
+            def iterate():
+                total = 0
+                for item in obj:
+                    total += item
+                return total
+            iter_time, total = timed(iterate)
+
+            if isinstance(obj, TypedList):
+                reduce_time, result = timed(lambda: (obj.sum(), obj.min(), obj.max()))
+            else:
+                reduce_time, result = timed(lambda: (sum(obj.my_list), min(obj.my_list), max(obj.my_list)))
+            assert result[0] == total
+            print("{:>12,} {:<11} {:>11.3f}s {:>11.3f}s {:>11.3f}s".format(n, name, build_time, iter_time, reduce_time))
+        del obj
+
+
+if __name__ == '__main__':
+    import sys
+
+    obj = TypedList.random(5)
+    print(obj)
+    view = obj[1:4]
+    view[0] = 0                  # writes through to obj
+    print(obj, view, len(view))
+    print(obj + 1, obj * obj, obj.sum(), obj.min(), obj.max())
+    for item in obj:
+        print(item)
+
+    # python typed_list.py 6 7 8   -> 10**6, 10**7 and 10**8 elements
+    benchmark(tuple(int(arg) for arg in sys.argv[1:]) or (6, 7))